@@ -7,11 +7,33 @@ echo
 
 # ci 환경에서는 추후 ollama가 아니라 llama.cpp로 변경하는 것이 나음
 # 1) make sure the model is available in local ollama
-MODEL=$(grep 'model:' "$CONFIG_FILE" | head -n 1 | sed 's/.*model: "\(.*\)"/\1/')
+# anchor to the llm: key so comments mentioning "model:" are not matched
+MODEL=$(grep '^  model:' "$CONFIG_FILE" | head -n 1 | sed 's/.*model: "\(.*\)"/\1/')
+SMALL_MODEL=$(grep '^  small_model:' "$CONFIG_FILE" | head -n 1 | sed 's/.*small_model: "\(.*\)"/\1/')
+WORKERS=$(grep '^  workers:' "$CONFIG_FILE" | head -n 1 | sed 's/[^0-9]*\([0-9]*\).*/\1/')
+LANGUAGE_WORKERS=$(grep '^  language_workers:' "$CONFIG_FILE" | head -n 1 | sed 's/[^0-9]*\([0-9]*\).*/\1/')
 if command -v ollama >/dev/null 2>&1; then
+  # without OLLAMA_NUM_PARALLEL ollama may serve one request at a time,
+  # so if no daemon is running, start one with a slot per translate worker
+  # (languages translated at once each send up to `workers` requests)
+  if ! ollama list >/dev/null 2>&1; then
+    export OLLAMA_NUM_PARALLEL=${OLLAMA_NUM_PARALLEL:-$(( ${WORKERS:-4} * ${LANGUAGE_WORKERS:-1} ))}
+    echo "[ci.sh] starting ollama serve (OLLAMA_NUM_PARALLEL=$OLLAMA_NUM_PARALLEL) ..."
+    ollama serve > ollama.log 2>&1 &
+    OLLAMA_PID=$!
+    trap 'kill $OLLAMA_PID 2>/dev/null || true' EXIT
+    for _ in $(seq 1 30); do
+      ollama list >/dev/null 2>&1 && break
+      sleep 1
+    done
+  fi
   echo "[local.sh] pulling model: $MODEL ..."
   # if the model already exists, this is a quick no-op
   ollama pull $MODEL || echo "[local.sh] warning: could not pull model (ollama daemon running?)"
+  if [ -n "$SMALL_MODEL" ]; then
+    echo "[ci.sh] pulling small model: $SMALL_MODEL ..."
+    ollama pull "$SMALL_MODEL" || echo "[ci.sh] warning: could not pull small model"
+  fi
 else
   echo "[local.sh] warning: ollama is not installed or not in PATH. skipping model pull."
 fi
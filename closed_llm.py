@@ -1,9 +1,23 @@
 # === Closed-source LLM helpers (optional) ===
 import os
+from functools import lru_cache
 from openai import OpenAI
 import anthropic
 import google.generativeai as genai
 
+
+@lru_cache(maxsize=None)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """Return a process-wide OpenAI client (reuses HTTP connections)."""
+    return OpenAI(api_key=api_key, max_retries=3)
+
+
+@lru_cache(maxsize=None)
+def _get_claude_client(api_key: str) -> anthropic.Anthropic:
+    """Return a process-wide Anthropic client (reuses HTTP connections)."""
+    return anthropic.Anthropic(api_key=api_key, max_retries=3)
+
+
 def call_openai_chat(messages, model: str = "gpt-4o"):
     """
     Call the OpenAI Chat Completions API.
@@ -27,7 +41,7 @@ def call_openai_chat(messages, model: str = "gpt-4o"):
     if not api_key:
         raise RuntimeError("Missing OPENAI_API_KEY. Please set it in your environment.")
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = _get_openai_client(api_key)
     resp = client.chat.completions.create(
         model=model,
         messages=messages,
@@ -64,7 +78,7 @@ def call_claude_chat(messages, model: str = "claude-3-5-haiku-latest", system: s
     if not api_key:
         raise RuntimeError("Missing ANTHROPIC_API_KEY. Please set it in your environment.")
 
-    client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    client = _get_claude_client(api_key)
     api_params = {
         "model": model,
         "max_tokens": 4096,
@@ -76,12 +90,26 @@ def call_claude_chat(messages, model: str = "claude-3-5-haiku-latest", system: s
     # Claude는 content가 list로 옴
     return resp.content[0].text.strip()
 
+@lru_cache(maxsize=None)
+def _configure_gemini(api_key: str) -> None:
+    """Configure the Gemini SDK once per API key."""
+    genai.configure(api_key=api_key)
+
+
+@lru_cache(maxsize=32)
+def _get_gemini_model(model: str, system_instruction: str | None):
+    """Return a cached GenerativeModel for (model, system instruction)."""
+    return genai.GenerativeModel(model, system_instruction=system_instruction)
+
+
 def call_gemini_chat(messages, model="gemini-1.5-flash"):
     """
     Call the Google Gemini API using a chat-style message sequence.
 
-    Gemini's API does not use the same role-based structure as OpenAI/Anthropic,
-    so this function flattens all messages into a single combined text prompt.
+    The system message is passed as the model's `system_instruction`, and
+    the remaining messages are sent as user/model turns. The model object
+    is cached per (model, system instruction), so batches of the same
+    language reuse it instead of resending a flattened prompt.
     The `GEMINI_API_KEY` environment variable must be set.
 
     Args:
@@ -98,14 +126,24 @@ def call_gemini_chat(messages, model="gemini-1.5-flash"):
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise RuntimeError("Missing GEMINI_API_KEY. Please set it in your environment.")
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    _configure_gemini(api_key)
 
-    combined_prompt = ""
+    system_parts = []
+    contents = []
     for msg in messages:
         role = msg.get("role", "user")
         content = msg.get("content", "")
-        combined_prompt += f"{role.upper()}:\n{content}\n\n"
-
-    response = genai.GenerativeModel(model).generate_content(combined_prompt)
-
-    return response.text.strip()
\ No newline at end of file
+        if role == "system":
+            system_parts.append(content)
+        else:
+            # Gemini calls the assistant role "model"
+            contents.append({
+                "role": "model" if role == "assistant" else "user",
+                "parts": [content],
+            })
+
+    system_instruction = "\n\n".join(system_parts) or None
+    response = _get_gemini_model(model, system_instruction).generate_content(
+        contents)
+
+    return response.text.strip()
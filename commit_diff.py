@@ -2,12 +2,25 @@ import os
 import subprocess
 import shutil
 import argparse
+import concurrent.futures
+import tempfile
 from babel.messages import pofile, Catalog
+from babel.messages.pofile import unescape
 from config_loader import load_config
 
 def run_git(args, cwd=None):
     subprocess.check_call(["git"] + args, cwd=cwd)
 
+def add_worktree(repo_dir, commit, path):
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    run_git(["worktree", "add", "--detach", path, commit], cwd=repo_dir)
+
+
+def remove_worktree(repo_dir, path):
+    run_git(["worktree", "remove", "--force", path], cwd=repo_dir)
+
+
 def run_pybabel(output_file, run_dir, project_name, scan_target):
     cmd = [
         "pybabel", "--quiet", "extract",
@@ -18,21 +31,110 @@ def run_pybabel(output_file, run_dir, project_name, scan_target):
         "-k", "_C:1c,2",
         "-k", "_P:1,2",
         "-o", output_file,
-        scan_target
     ]
-    print(f"Running pybabel on '{scan_target}' -> {os.path.basename(output_file)}...")
+    targets = scan_target if isinstance(scan_target, list) else [scan_target]
+    cmd += targets
+    print(f"Running pybabel on '{' '.join(targets)}' "
+          f"-> {os.path.basename(output_file)}...")
     subprocess.check_call(cmd, cwd=run_dir)
 
+
+def list_extract_shards(run_dir, scan_target):
+    """scan_target을 pybabel을 나눠 실행할 수 있는 단위로 분할한다.
+
+    pybabel은 상위 디렉터리의 파일을 하위 디렉터리보다 먼저, 이름 순으로
+    추출하므로 그 순서를 그대로 유지하고, '.'/'_'로 시작하는 디렉터리는
+    pybabel과 동일하게 제외한다.
+    """
+    files = []
+    dirs = []
+    for name in sorted(os.listdir(os.path.join(run_dir, scan_target))):
+        path = os.path.join(scan_target, name)
+        if os.path.isdir(os.path.join(run_dir, path)):
+            if not name.startswith((".", "_")):
+                dirs.append(path)
+        else:
+            files.append(path)
+    return ([files] if files else []) + dirs
+
+
+def run_pybabel_parallel(output_file, run_dir, project_name, scan_target,
+                         max_workers=None):
+    """scan_target의 하위 디렉터리별로 pybabel을 병렬 실행한 뒤 하나로 합친다."""
+    shards = list_extract_shards(run_dir, scan_target)
+    if len(shards) <= 1:
+        run_pybabel(output_file, run_dir, project_name, scan_target)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        part_files = [
+            os.path.join(tmp_dir, f"part_{i}.pot") for i in range(len(shards))
+        ]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count()
+        ) as executor:
+            futures = [
+                executor.submit(run_pybabel, part, run_dir,
+                                project_name, shard)
+                for part, shard in zip(part_files, shards)
+            ]
+            for future in futures:
+                future.result()
+
+        # shard 순서대로 합쳐야 단일 실행과 같은 메시지 순서가 됨
+        merged = None
+        for part in part_files:
+            with open(part, 'rb') as f:
+                cat = pofile.read_po(f)
+            if merged is None:
+                merged = cat
+                continue
+            for message in cat:
+                if message.id:
+                    merged[message.id] = message
+
+    with open(output_file, 'wb') as f:
+        pofile.write_po(f, merged)
+
+
+def iter_msgids(path):
+    """POT 파일에서 msgid만 읽어온다. Catalog/Message 객체는 만들지 않는다.
+
+    복수형 entry는 read_po와 같게 (msgid, msgid_plural) 튜플로 돌려준다.
+    """
+    msgid = plural = current = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('msgid "'):
+                msgid = [unescape(line[6:].strip())]
+                plural = None
+                current = msgid
+            elif line.startswith('msgid_plural "'):
+                plural = [unescape(line[13:].strip())]
+                current = plural
+            elif line.startswith('"'):
+                if current is not None:
+                    current.append(unescape(line.strip()))
+            elif line.startswith('msgstr'):
+                if msgid is not None:
+                    mid = ''.join(msgid)
+                    if mid:
+                        yield (mid, ''.join(plural)) if plural else mid
+                msgid = plural = current = None
+            else:
+                current = None
+
+
 def extract_diff(new_pot, old_pot, output_diff):
     print(f"Comparing New vs Old POT...")
     try:
         with open(new_pot, 'rb') as f: new_cat = pofile.read_po(f)
-        with open(old_pot, 'rb') as f: old_cat = pofile.read_po(f)
+        # old POT은 msgid 비교에만 쓰이므로 전체 Catalog로 읽지 않음
+        old_ids = frozenset(iter_msgids(old_pot))
     except FileNotFoundError as e:
         print(f"[ERROR] {e}")
         return 0
 
-    old_ids = {entry.id for entry in old_cat if entry.id}
     diff_cat = Catalog(
         project=new_cat.project,
         version=new_cat.version,
@@ -72,7 +174,7 @@ def main():
     repo_dir = os.path.join(work_dir, project)
     
     target_commit = cfg['git']['target_commit']
-    base_commit = "HEAD~1"
+    base_commit = f"{target_commit}~1"
 
     pot_dir = "./pot"
     source_dir = project
@@ -97,27 +199,38 @@ def main():
         if os.path.exists(repo_dir): shutil.rmtree(repo_dir)
         run_git(["clone", repo_url, repo_dir])
 
-    current_head = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=repo_dir).decode().strip()
-
     new_pot = os.path.abspath(os.path.join(pot_dir, f"new_{target_commit}.pot"))
     old_pot = os.path.abspath(os.path.join(pot_dir, f"old_{target_commit}.pot"))
     diff_pot = os.path.abspath(os.path.join(pot_dir, f"{target_file_name}.pot"))
 
+    # 메인 checkout은 건드리지 않고, 두 commit을 각각 별도 worktree로 꺼냄
+    new_tree = os.path.abspath(os.path.join(work_dir, f"{project}_new"))
+    old_tree = os.path.abspath(os.path.join(work_dir, f"{project}_old"))
+    run_git(["worktree", "prune"], cwd=repo_dir)
+
     try:
-        # 2. New POT 생성 (Target Commit)
+        # 2. Target / Base commit worktree 준비
         print(f"Checkout Target: {target_commit}")
-        run_git(["checkout", target_commit], cwd=repo_dir)
-        run_pybabel(new_pot, repo_dir, project_name, source_dir)
-
-        # 3. Old POT 생성 (Base Commit)
+        add_worktree(repo_dir, target_commit, new_tree)
         print(f"Checkout Base: {base_commit}")
-        run_git(["checkout", base_commit], cwd=repo_dir)
-        run_pybabel(old_pot, repo_dir, project_name, source_dir)
+        add_worktree(repo_dir, base_commit, old_tree)
+
+        # 3. New / Old POT 생성을 동시에 실행
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(run_pybabel_parallel, new_pot, new_tree,
+                                project_name, source_dir),
+                executor.submit(run_pybabel_parallel, old_pot, old_tree,
+                                project_name, source_dir),
+            ]
+            for future in futures:
+                future.result()
 
     finally:
-        # 4. 복구
-        print(f"Restoring HEAD to {current_head}")
-        run_git(["checkout", current_head], cwd=repo_dir)
+        # 4. worktree 정리
+        for tree in (new_tree, old_tree):
+            if os.path.isdir(tree):
+                remove_worktree(repo_dir, tree)
 
     # 5. 결과 추출
     count = extract_diff(new_pot, old_pot, diff_pot)
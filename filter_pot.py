@@ -3,24 +3,53 @@ import sys
 import polib
 import os
 import argparse
-from copy import deepcopy
 from config_loader import load_config
 
 def is_untranslated(entry: polib.POEntry) -> bool:
-    """msgstr(또는 복수형 msgstr_plural) 중 하나라도 채워져 있으면 '번역됨'으로 판단."""
-    # 헤더 건드리지 않음
-    if entry.msgid == "":
-        return False
-
-    # 주석 처리된 엔트리는 무시
-    if entry.obsolete:
-        return False
+    """msgstr(또는 복수형 msgstr_plural) 중 하나라도 채워져 있으면 '번역됨'으로 판단.
 
+    헤더/obsolete 엔트리는 호출하는 쪽(extract_untranslated)에서 거른다.
+    strip() 대신 isspace()를 써서 엔트리마다 새 문자열을 만들지 않는다.
+    """
     # 복수형일 때
     if entry.msgid_plural:
-        return not any(s.strip() for s in entry.msgstr_plural.values())
+        return all(not s or s.isspace()
+                   for s in entry.msgstr_plural.values())
     # 단수형일 때
-    return not bool(entry.msgstr.strip())
+    msgstr = entry.msgstr
+    return not msgstr or msgstr.isspace()
+
+def to_pot_entry(entry: polib.POEntry) -> polib.POEntry:
+    """msgstr을 비운 POT용 entry 생성. deepcopy 대신 필요한 필드만 복사한다."""
+    return polib.POEntry(
+        msgid=entry.msgid,
+        msgid_plural=entry.msgid_plural,
+        msgctxt=entry.msgctxt,
+        comment=entry.comment,
+        tcomment=entry.tcomment,
+        occurrences=list(entry.occurrences),
+        flags=list(entry.flags),
+        previous_msgctxt=entry.previous_msgctxt,
+        previous_msgid=entry.previous_msgid,
+        previous_msgid_plural=entry.previous_msgid_plural,
+    )
+
+
+def extract_untranslated(src_po: polib.POFile):
+    """src_po에서 미번역 엔트리만 모은 POFile과 그 개수를 반환."""
+    result = polib.POFile()
+    result.metadata = src_po.metadata
+
+    count = 0
+    for e in src_po:
+        # 헤더와 주석 처리된(obsolete) 엔트리는 건드리지 않음
+        if not e.msgid or e.obsolete:
+            continue
+        if is_untranslated(e):
+            result.append(to_pot_entry(e))
+            count += 1
+    return result, count
+
 
 def build_fallback_pot_path(translated_po_path):
     
@@ -69,18 +98,7 @@ def main(translated_po_path, out_pot_path="remaining.pot"):
             return
 
         # 미번역 엔트리만 추출
-        result = polib.POFile()
-        result.metadata = base_po.metadata
-
-        count = 0
-        for e in base_po:
-            if is_untranslated(e):
-                new_e = deepcopy(e)
-                new_e.msgstr = ""
-                new_e.msgstr_plural = {}
-                result.append(new_e)
-                count += 1
-
+        result, count = extract_untranslated(base_po)
         result.save(out_pot_path)
         print(f"[+] Generated POT from fallback source: {out_pot_path}")
         print(f"[*] Untranslated entries: {count}")
@@ -96,18 +114,7 @@ def main(translated_po_path, out_pot_path="remaining.pot"):
         open(out_pot_path, "w").close()
         return
 
-    result = polib.POFile()
-    result.metadata = trans_po.metadata
-
-    count = 0
-    for e in trans_po:
-        if is_untranslated(e):
-            new_e = deepcopy(e)
-            new_e.msgstr = ""
-            new_e.msgstr_plural = {}
-            result.append(new_e)
-            count += 1
-
+    result, count = extract_untranslated(trans_po)
     result.save(out_pot_path)
     print(f"[+] POT saved: {out_pot_path}")
     print(f"[*] Untranslated entries: {count}")
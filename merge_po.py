@@ -1,74 +1,131 @@
 #!/usr/bin/env python3
 import polib
 import os
+import sys
+import concurrent.futures
 from config_loader import load_config
 import argparse
 
-parser = argparse.ArgumentParser()
-parser.add_argument(
-    "--config",
-    default="config.yaml",
-    help="Path to config YAML (default: config.yaml)",
-)
-
-args = parser.parse_args()
-cfg = load_config("config.yaml")
-files_cfg = cfg.get("files", {})
-model = cfg["llm"]["model"]
-project = cfg["git"]["project"] 
-
-for lang in cfg["languages"]:
-    
-    target_file = files_cfg["target_file"]
+
+def merge_language(lang, target_file, model, verbose=False):
+    """
+    한 언어의 LLM 번역 PO를 원본 target PO에 병합해 ./data/result에 저장한다.
+    Merges the AI-translated PO of one language into its target PO.
+
+    언어마다 독립적인 파일만 다루므로 별도 프로세스에서 실행할 수 있다.
+    verbose가 True이면 entry별 번역 전/후 비교를 모아 한 번에 출력한다.
+
+    Returns:
+        int: 업데이트된 entry 개수
+    """
     target_file_path = os.path.join(f"./data/target/{lang}", target_file)
     target_file_name, _ = os.path.splitext(target_file)
     # PO 파일 로드
-    target_file = polib.pofile(target_file_path)
+    target_po = polib.pofile(target_file_path)
     llm_path = f"./po/{model}/{lang}/{target_file_name}.po"
     llm = polib.pofile(llm_path)
     out_path = f"./data/result/{lang}/{target_file_name}.po"
-    
+
     # standard_po 헤더(metadata) 백업
-    original_metadata = target_file.metadata.copy()
+    original_metadata = target_po.metadata.copy()
 
-    # LLM_PO에서 msgid -> POEntry 매핑
-    llm_dict = {entry.msgid: entry for entry in llm}
+    # LLM_PO에서 번역이 채워진 entry만 msgid -> POEntry 매핑
+    # (strip() 대신 isspace()로 검사해 entry마다 새 문자열을 만들지 않음)
+    llm_dict = {
+        entry.msgid: entry for entry in llm
+        if entry.msgstr and not entry.msgstr.isspace()
+    }
+    get_llm_entry = llm_dict.get
 
     updated_count = 0
-    print(f"[Lang: {lang}] [*] 번역 삽입 전/후 비교:")
+    diff_lines = []
+
+    for entry in target_po:
+        # standard_po에 이미 번역이 있으면 덮어쓰지 않음
+        msgstr = entry.msgstr
+        if msgstr and not msgstr.isspace():
+            continue
+        llm_entry = get_llm_entry(entry.msgid)
+        if llm_entry is None:
+            continue
 
-    for entry in target_file:
-        if entry.msgid in llm_dict:
-            llm_entry = llm_dict[entry.msgid]
+        if verbose:
+            diff_lines.append(
+                f"[Lang: {lang}]\n--- msgid: {entry.msgid}\n"
+                f"[Lang: {lang}]- before: {entry.msgstr}\n"
+                f"[Lang: {lang}]+ after : {llm_entry.msgstr}\n"
+            )
 
-            # standard_po에 이미 번역이 있으면 덮어쓰지 않음
-            if not entry.msgstr.strip() and llm_entry.msgstr.strip():
-                print(f"[Lang: {lang}]\n--- msgid: {entry.msgid}")
-                print(f"[Lang: {lang}]- before: {entry.msgstr}")
-                print(f"[Lang: {lang}]+ after : {llm_entry.msgstr}")
+        # msgstr 갱신
+        entry.msgstr = llm_entry.msgstr
 
-                # msgstr 갱신
-                entry.msgstr = llm_entry.msgstr
+        # comment, tcomment, flags, previous comments 유지
+        if hasattr(llm_entry, 'comment') and llm_entry.comment:
+            entry.comment = llm_entry.comment
+        if hasattr(llm_entry, 'tcomment') and llm_entry.tcomment:
+            entry.tcomment = llm_entry.tcomment
+        if hasattr(llm_entry, 'flags') and llm_entry.flags:
+            entry.flags = llm_entry.flags
 
-                # comment, tcomment, flags, previous comments 유지
-                if hasattr(llm_entry, 'comment') and llm_entry.comment:
-                    entry.comment = llm_entry.comment
-                if hasattr(llm_entry, 'tcomment') and llm_entry.tcomment:
-                    entry.tcomment = llm_entry.tcomment
-                if hasattr(llm_entry, 'flags') and llm_entry.flags:
-                    entry.flags = llm_entry.flags
+        if hasattr(llm_entry, 'references') and llm_entry.references:
+            entry.references = llm_entry.references
 
-                if hasattr(llm_entry, 'references') and llm_entry.references:
-                    entry.references = llm_entry.references
+        updated_count += 1
 
-                updated_count += 1
+    if verbose:
+        sys.stdout.write(
+            f"[Lang: {lang}] [*] 번역 삽입 전/후 비교:\n"
+            + "".join(diff_lines)
+        )
 
     # 저장 전에 헤더 복원
-    target_file.metadata = original_metadata
+    target_po.metadata = original_metadata
 
     # 결과 저장
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    target_file.save(out_path)
+    target_po.save(out_path)
 
     print(f"[Lang: {lang}]\n[+] 총 {updated_count}개 항목이 업데이트되었습니다.")
     print(f"[Lang: {lang}][+] 결과 파일: {out_path}")
+    return updated_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--config",
+        default="config.yaml",
+        help="Path to config YAML (default: config.yaml)",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print msgid / before / after for every updated entry",
+    )
+
+    args = parser.parse_args()
+    cfg = load_config(args.config)
+    files_cfg = cfg.get("files", {})
+    model = cfg["llm"]["model"]
+    target_file = files_cfg["target_file"]
+    languages = cfg["languages"]
+
+    if len(languages) == 1:
+        merge_language(languages[0], target_file, model, args.verbose)
+        return
+
+    # 언어별 병합은 서로 독립적이므로 프로세스 단위로 병렬 실행
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(len(languages), os.cpu_count() or 1)
+    ) as executor:
+        futures = [
+            executor.submit(merge_language, lang, target_file, model,
+                            args.verbose)
+            for lang in languages
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,11 @@ import ollama
 import os
 import time
 import concurrent.futures
+import functools
 import json
+import hashlib
+import re
+import threading
 import argparse
 from tqdm import tqdm
 from babel.messages import pofile, Catalog
@@ -29,38 +33,142 @@ from utils import (
     init_environment,
     load_glossary,
     load_fixed_examples,
-    save_experiment_log
+    open_translation_cache,
+    load_cached_translations,
+    save_cached_translations,
+    save_experiment_log,
+    LANG_MAP,
 )
 from closed_llm import *
 from config_loader import load_config
 
 # Global LLM configuration
 LLM_MODE = "ollama"
+MODEL_NAME = None
 CALL_LLM_FN = None
+# Optional smaller model for short entries (see configure_llm_caller)
+CALL_SMALL_LLM_FN = None
+SMALL_MODEL_NAME = None
+# Optional prompt-prefix warm-up (Ollama only, see configure_llm_caller)
+WARM_UP_FN = None
+
+# Entries up to this many characters may be routed to the small model
+SMALL_MODEL_MAX_CHARS = 40
+
+# Keep the Ollama model loaded between batches and languages so the KV cache
+# of the shared system prompt + few-shot prefix can be reused by the server.
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Upper bound for generated tokens per Ollama call (llm.num_predict). The
+# actual limit is scaled to the batch input so a short batch cannot run
+# away into a long repetition loop.
+OLLAMA_MAX_PREDICT = 1024
+
+# Seconds before an Ollama request is abandoned (None: wait forever), and
+# how many times a timed-out / failed request is retried with backoff.
+OLLAMA_TIMEOUT = None
+OLLAMA_MAX_RETRIES = 2
+
+# If True, each batch prompt only carries the glossary terms it contains
+PRUNE_GLOSSARY = False
+
+# Optional sqlite cache of (model, language, msgid) -> msgstr
+TRANSLATION_CACHE = None
+# Serializes access to the cache connection shared by language threads
+CACHE_LOCK = threading.Lock()
+
+# Default glossary / few-shot examples, used when translate_pot_file()
+# is called without the per-language ones
+GLOSSARY = {}
+FEW_SHOT_EXAMPLES = []
 
 # START/END indices for translation (None means no limit)
 START_TRANSLATE = None
 END_TRANSLATE = None
 
-def configure_llm_caller(llm_mode: str, model_name: str):
+def ollama_options(num_thread: int | None = None,
+                   num_ctx: int | None = None):
     """
-    Configure which LLM backend to use for translation.
+    Ollama 호출에 공통으로 쓰는 sampling/runner 옵션.
+    Runner options such as num_thread/num_ctx must match between calls,
+    otherwise Ollama reloads the model and drops its prompt cache.
+    """
+    options = {
+        "temperature": 0,
+        "top_p": 1,
+        "repetition_penalty": 1.2,
+    }
+    if num_thread:
+        options["num_thread"] = num_thread
+    if num_ctx:
+        options["num_ctx"] = num_ctx
+    return options
+
+
+@functools.lru_cache(maxsize=None)
+def get_ollama_client():
+    """
+    warm-up / 기본 모델 / 작은 모델 호출이 함께 쓰는 Ollama client.
+    The client's httpx connection pool keeps connections alive (the host
+    comes from OLLAMA_HOST), so every worker reuses the same pool.
+    """
+    return ollama.Client(timeout=OLLAMA_TIMEOUT)
 
-    This function is called once in main() and sets the global
-    CALL_LLM_FN so that translate_batch() can simply call it
-    without re-selecting the backend for every batch.
+
+def is_retryable_ollama_error(error):
     """
-    global LLM_MODE, CALL_LLM_FN
-    LLM_MODE = llm_mode
+    다시 시도할 만한 Ollama 오류인지 판단한다.
+    Timeouts, connection errors and 5xx responses are transient; invalid
+    requests and 4xx responses (e.g. unknown model) fail the same way again.
+    """
+    if isinstance(error, ollama.RequestError):
+        return False
+    if isinstance(error, ollama.ResponseError):
+        return error.status_code >= 500
+    return True
+
+
+def build_ollama_warm_up(model_name: str, num_thread: int | None = None,
+                         num_ctx: int | None = None):
+    """
+    공통 prompt prefix를 미리 한 번 처리해 두는 함수를 만들어 반환한다.
+    Returns a callable that loads the model and prefills the shared
+    system + few-shot prefix (num_predict=1), so the first batches of a
+    language hit Ollama's prompt cache instead of all prefilling it.
+    """
+    client = get_ollama_client()
+    options = {**ollama_options(num_thread, num_ctx), "num_predict": 1}
+
+    def _warm_up(prefix_messages):
+        client.chat(
+            model=model_name,
+            messages=prefix_messages,
+            stream=False,
+            options=options,
+            keep_alive=OLLAMA_KEEP_ALIVE,
+        )
+
+    return _warm_up
+
+
+def build_llm_caller(llm_mode: str, model_name: str,
+                     num_thread: int | None = None,
+                     num_ctx: int | None = None):
+    """
+    선택한 LLM backend로 messages를 보내는 함수를 만들어 반환한다.
+    Builds a callable that sends chat messages to the given backend/model.
 
+    The callable takes (messages, expected_items=None). For Ollama,
+    expected_items constrains the reply to a JSON array of that length.
+    """
     if llm_mode == "gpt":
-        def _call(messages):
+        def _call(messages, expected_items=None):
             return call_openai_chat(
                 messages,
                 model=model_name,
             )
     elif llm_mode == "claude":
-        def _call(messages):
+        def _call(messages, expected_items=None):
             claude_messages = []
             claude_system = None
             for msg in messages:
@@ -74,84 +182,164 @@ def configure_llm_caller(llm_mode: str, model_name: str):
                 system=claude_system,
             )
     elif llm_mode == "gemini":
-        def _call(messages):
+        def _call(messages, expected_items=None):
             return call_gemini_chat(
                 messages,
                 model=model_name,
             )
     else:
         # Default: local Ollama model
-        def _call(messages):
-            response = ollama.chat(
-                model=model_name,
-                messages=messages,
-                stream=False,
-                options={
-                    "temperature": 0,
-                    "top_p": 1,
-                    "repetition_penalty": 1.2,
-                },
-            )
-            return response["message"]["content"].strip()
-
-    CALL_LLM_FN = _call
-
-LANG_MAP = {
-    "vi_VN": "Vietnamese (Vietnam)",
-    "ur": "Urdu",
-    "tr_TR": "Turkish (Turkey)",
-    "Th": "Thai",
-    "te_IN": "Telugu (India)",
-    "ta": "Tamil",
-    "es_MX": "Spanish (Mexico)",
-    "es": "Spanish",
-    "sl_SI": "Slovenian (Slovenia)",
-    "sr": "Serbian",
-    "ru": "Russian",
-    "Ro": "Romanian",
-    "pa_IN": "Punjabi (India)",
-    "pt_BR": "Portuguese (Brazil)",
-    "pt": "Portuguese",
-    "pl_PL": "Polish (Poland)",
-    "fa": "Persian",
-    "ne": "Nepali",
-    "mr": "Marathi",
-    "mni": "Manipuri",
-    "mai": "Maithili",
-    "lo": "Lao",
-    "ko_KR": "Korean (South Korea)",
-    "kok": "Konkani",
-    "ks": "Kashmiri",
-    "kn": "Kannada",
-    "ja": "Japanese",
-    "it": "Italian",
-    "id": "Indonesian",
-    "hu": "Hungarian",
-    "hi": "Hindi",
-    "he": "Hebrew",
-    "gu": "Gujarati",
-    "el": "Greek",
-    "de": "German",
-    "ka_GE": "Georgian (Georgia)",
-    "fr": "French",
-    "fi_FI": "Finnish (Finland)",
-    "fil": "Filipino",
-    "eo": "Esperanto",
-    "en_US": "English (United States)",
-    "en_GB": "English (United Kingdom)",
-    "en_AU": "English (Australia)",
-    "nl_NL": "Dutch (Netherlands)",
-    "cs": "Czech",
-    "zh_TW": "Chinese (Taiwan)",
-    "zh_CN": "Chinese (China)",
-    "ca": "Catalan",
-    "bg_BG": "Bulgarian (Bulgaria)",
-    "brx": "Bodo",
-    "bn_IN": "Bengali (India)",
-    "as": "Assamese",
-    "ar": "Arabic",
-    "sq": "Albanian",
-}
+        # One client is shared by every worker thread (and by the warm-up
+        # and small-model callers) so all batches reuse one connection pool.
+        client = get_ollama_client()
+        options = ollama_options(num_thread, num_ctx)
+
+        def _call(messages, expected_items=None):
+            for attempt in range(OLLAMA_MAX_RETRIES + 1):
+                try:
+                    response = client.chat(
+                        model=model_name,
+                        messages=messages,
+                        stream=False,
+                        options={
+                            **options,
+                            "num_predict": estimate_num_predict(messages),
+                        },
+                        format=(batch_response_schema(expected_items)
+                                if expected_items else None),
+                        keep_alive=OLLAMA_KEEP_ALIVE,
+                    )
+                    return response["message"]["content"].strip()
+                except Exception as e:
+                    if (attempt == OLLAMA_MAX_RETRIES
+                            or not is_retryable_ollama_error(e)):
+                        raise
+                    # hung / overloaded server: back off before retrying
+                    time.sleep(2 ** attempt)
+
+    return _call
+
+
+def build_rate_limiter(requests_per_minute: float):
+    """
+    모든 worker가 공유하는 요청 속도 제한 함수를 만들어 반환한다.
+    Returns an acquire() function that spaces requests evenly so that at
+    most requests_per_minute calls start per minute across all threads.
+    """
+    interval = 60.0 / requests_per_minute
+    lock = threading.Lock()
+    next_slot = time.monotonic()
+
+    def _acquire():
+        nonlocal next_slot
+        with lock:
+            now = time.monotonic()
+            wait = next_slot - now
+            next_slot = max(now, next_slot) + interval
+        if wait > 0:
+            time.sleep(wait)
+
+    return _acquire
+
+
+def with_rate_limit(call_fn, acquire):
+    """call_fn을 호출하기 전에 acquire()로 차례를 기다리도록 감싼다."""
+    def _call(messages, expected_items=None):
+        acquire()
+        return call_fn(messages, expected_items=expected_items)
+
+    return _call
+
+
+def configure_llm_caller(llm_mode: str, model_name: str,
+                         num_thread: int | None = None,
+                         small_model_name: str | None = None,
+                         num_ctx: int | None = None,
+                         requests_per_minute: float | None = None):
+    """
+    Configure which LLM backend to use for translation.
+
+    This function is called once in main() and sets the global
+    CALL_LLM_FN so that translate_batch() can simply call it
+    without re-selecting the backend for every batch.
+
+    num_thread and num_ctx are only used by the Ollama backend. When they
+    are None, Ollama picks the physical core count / its default context.
+
+    For Ollama, WARM_UP_FN is set to prefill the shared prompt prefix
+    once per language before the batches are sent.
+
+    If small_model_name is given, CALL_SMALL_LLM_FN is set as well and
+    short entries without glossary terms are sent to that model instead.
+
+    If requests_per_minute is given, every LLM call waits for a slot of a
+    rate limiter shared by all worker threads (useful for hosted APIs).
+    """
+    global LLM_MODE, CALL_LLM_FN, CALL_SMALL_LLM_FN, WARM_UP_FN
+    global MODEL_NAME, SMALL_MODEL_NAME
+    LLM_MODE = llm_mode
+    MODEL_NAME = model_name
+    SMALL_MODEL_NAME = small_model_name or None
+
+    CALL_LLM_FN = build_llm_caller(
+        llm_mode, model_name, num_thread, num_ctx)
+    WARM_UP_FN = None
+    if llm_mode not in ("gpt", "claude", "gemini"):
+        WARM_UP_FN = build_ollama_warm_up(model_name, num_thread, num_ctx)
+    CALL_SMALL_LLM_FN = None
+    if small_model_name:
+        CALL_SMALL_LLM_FN = build_llm_caller(
+            llm_mode, small_model_name, num_thread, num_ctx)
+
+    if requests_per_minute:
+        # 두 모델이 같은 API 한도를 쓰므로 하나의 limiter를 공유
+        acquire = build_rate_limiter(requests_per_minute)
+        CALL_LLM_FN = with_rate_limit(CALL_LLM_FN, acquire)
+        if CALL_SMALL_LLM_FN is not None:
+            CALL_SMALL_LLM_FN = with_rate_limit(CALL_SMALL_LLM_FN, acquire)
+
+
+def batch_response_schema(expected_items):
+    """
+    batch 응답이 정확히 expected_items개의 문자열 배열이 되도록 하는 JSON schema.
+    Ollama uses it to constrain decoding, so the reply is always a
+    parseable JSON array of the right length.
+    """
+    return {
+        "type": "array",
+        "items": {"type": "string"},
+        "minItems": expected_items,
+        "maxItems": expected_items,
+    }
+
+
+def estimate_num_predict(messages):
+    """
+    번역 대상이 담긴 마지막 user 메시지 길이로 출력 토큰 상한을 추정한다.
+    Estimates a num_predict budget from the size of the batch input.
+
+    번역문은 언어에 따라 토큰 수가 원문보다 2~3배까지 늘어날 수 있으므로
+    문자 수 정도를 상한으로 잡고 OLLAMA_MAX_PREDICT로 제한한다.
+    """
+    return min(OLLAMA_MAX_PREDICT, len(messages[-1]["content"]) + 32)
+
+
+# 번역이 필요 없는 msgid: 숫자/기호/공백만 있는 문자열, URL, 단일 placeholder
+PASSTHROUGH_RE = re.compile(
+    r"^[\s\W\d_]*$"
+    r"|^https?://\S+$"
+    r"|^%(\([^)]+\))?[sd]$"
+    r"|^\{\w*\}$"
+)
+
+
+def is_passthrough(msgid):
+    """
+    LLM을 호출하지 않고 msgid를 그대로 msgstr로 쓸 수 있는지 판단한다.
+    Returns True for msgids that should be copied through unchanged.
+    """
+    return isinstance(msgid, str) and PASSTHROUGH_RE.match(msgid) is not None
+
 
 # --- 추가: 프롬프트 디렉터리 및 지원 프롬프트 로더 ---
 PROMPT_DIR = os.path.join(os.path.dirname(__file__), "prompts")
@@ -167,32 +355,7 @@ def load_support_prompt(language_code: str):
     return None
 
 
-# entry를 5개씩 묶은 batch 단위로 번역 수행
-def translate_batch(payload, language_code, language_name):
-    """
-    여러 entry를 batch로 묶어 LLM을 사용해 번역하는 함수.
-    Translates a batch of PO/POT entries using the selected LLM model.
-
-    Args:
-        payload (tuple): (entries, batch_index, total_batches)
-            entries (list): 번역 대상 메시지 객체 리스트
-            batch_index (int): 현재 batch 순서
-            total_batches (int): 전체 batch 수
-        language_code (str): 번역하는 언어 코드
-        language_name (str): 번역하는 언어 이름
-
-    Returns:
-        list: [(msgid, translation, locations), ...]
-                - 정상일 때: translation에 번역 문자열이 채워진다.
-                - 오류/파싱 실패 시: translation(msgstr)을 빈 문자열("")로 둔 채 반환한다.
-    """
-    entries, batch_idx, total_batches = payload
-
-    GLOSSARY_TEXT_LINES = [f"* '{en}': '{ko}'" for en, ko in GLOSSARY.items()]
-    FORMATTED_GLOSSARY = "\n".join(GLOSSARY_TEXT_LINES)
-    global PRINTED_CUSTOM_PROMPT_NOTICE
-
-    SYSTEM_PROMPT_BASE = """
+SYSTEM_PROMPT_BASE = """
     You are a strict translation engine.
     You are translating from English to {language_name}.
 
@@ -215,40 +378,120 @@ def translate_batch(payload, language_code, language_name):
     **[Glossary]**
     """
 
+
+def build_prompt_prefix(language_code, language_name, glossary=None,
+                        examples=None):
+    """
+    모든 batch가 공유하는 system prompt와 few-shot 메시지를 만드는 함수.
+    Builds the system + few-shot messages shared by every batch of a
+    language, so they are formatted once instead of once per batch.
+
+    Args:
+        language_code (str): 번역하는 언어 코드
+        language_name (str): 번역하는 언어 이름
+        glossary (dict | None): prompt에 넣을 용어집 (None이면 GLOSSARY 전체)
+        examples (list | None): few-shot 예시 (None이면 FEW_SHOT_EXAMPLES)
+
+    Returns:
+        list: chat messages (system, few-shot user, few-shot assistant)
+    """
+    global PRINTED_CUSTOM_PROMPT_NOTICE
+
+    system_prompt_base = SYSTEM_PROMPT_BASE
     custom_prompt_text = load_support_prompt(language_code)
     if custom_prompt_text:
         if not PRINTED_CUSTOM_PROMPT_NOTICE:
             print(f"Using custom support prompt for {language_code}")
             PRINTED_CUSTOM_PROMPT_NOTICE = True
-        SYSTEM_PROMPT_BASE = custom_prompt_text
-
-    SYSTEM_PROMPT = SYSTEM_PROMPT_BASE + FORMATTED_GLOSSARY
+        system_prompt_base = custom_prompt_text
+
+    if glossary is None:
+        glossary = GLOSSARY
+    if examples is None:
+        examples = FEW_SHOT_EXAMPLES
+
+    # 용어집에 중괄호가 있어도 깨지지 않도록 base prompt만 format
+    formatted_glossary = "\n".join(
+        f"* '{en}': '{ko}'" for en, ko in glossary.items())
+    system_prompt = (
+        system_prompt_base.format(language_name=language_name)
+        + formatted_glossary
+    )
 
-    entries, batch_idx, total_batches = payload
+    # Few-shot 예시 추가 (batch 형식)
+    example_input = [msgid for msgid, _ in examples]
+    example_output = [msgstr for _, msgstr in examples]
 
-    messages = [
+    return [
         # System 역할: 전체 규칙과 '전체' 용어집을 한 번에 전달
+        {"role": "system", "content": system_prompt},
         {
-            "role": "system",
-            "content": SYSTEM_PROMPT.format(language_name=language_name),
+            "role": "user",
+            "content": (
+                "Here are examples of translating a JSON array:\n"
+                f"{json.dumps(example_input, ensure_ascii=False)}"
+            ),
+        },
+        {
+            "role": "assistant",
+            "content": json.dumps(example_output, ensure_ascii=False),
         },
     ]
 
-    # Few-shot 예시 추가 (batch 형식)
-    example_input = [msgid for msgid, _ in FEW_SHOT_EXAMPLES]
-    example_output = [msgstr for _, msgstr in FEW_SHOT_EXAMPLES]
-
-    messages.append({
-        "role": "user",
-        "content": (
-            "Here are examples of translating a JSON array:\n"
-            f"{json.dumps(example_input, ensure_ascii=False)}"
-        )
-    })
-    messages.append({
-        "role": "assistant",
-        "content": json.dumps(example_output, ensure_ascii=False)
-    })
+
+def translation_cache_namespace(language_code, language_name,
+                                glossary=None, examples=None):
+    """
+    번역 캐시의 model 키: 모델명 + prompt/용어집/few-shot 예시의 fingerprint.
+    Cached translations are only reused while the model and the full
+    prompt prefix are unchanged, so editing a prompt, the glossary or
+    the examples invalidates them automatically.
+
+    작은 모델을 쓰면 그 모델명과 SMALL_MODEL_MAX_CHARS도 키에 넣어,
+    small_model 설정을 바꾸면 그 모델이 만든 번역을 재사용하지 않는다.
+    glossary pruning을 켜면 batch마다 prompt가 달라지므로 이것도 키에 넣는다.
+    """
+    prefix = build_prompt_prefix(
+        language_code, language_name, glossary, examples)
+    digest = hashlib.sha256(
+        json.dumps(prefix, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()[:16]
+    model = MODEL_NAME
+    if SMALL_MODEL_NAME:
+        model += f"+{SMALL_MODEL_NAME}<={SMALL_MODEL_MAX_CHARS}"
+    if PRUNE_GLOSSARY:
+        model += "+pruned"
+    return f"{model}@{digest}"
+
+
+# entry를 5개씩 묶은 batch 단위로 번역 수행
+def translate_batch(payload, language_code, language_name,
+                    use_small_model=False, prefix_messages=None):
+    """
+    여러 entry를 batch로 묶어 LLM을 사용해 번역하는 함수.
+    Translates a batch of PO/POT entries using the selected LLM model.
+
+    Args:
+        payload (tuple): (entries, batch_index, total_batches)
+            entries (list): 번역 대상 메시지 객체 리스트
+            batch_index (int): 현재 batch 순서
+            total_batches (int): 전체 batch 수
+        language_code (str): 번역하는 언어 코드
+        language_name (str): 번역하는 언어 이름
+        use_small_model (bool): True이면 CALL_SMALL_LLM_FN으로 번역
+        prefix_messages (list): build_prompt_prefix()의 결과.
+            None이면 이 batch에서 직접 만든다.
+
+    Returns:
+        list: [(msgid, translation, locations), ...]
+                - 정상일 때: translation에 번역 문자열이 채워진다.
+                - 오류/파싱 실패 시: translation(msgstr)을 빈 문자열("")로 둔 채 반환한다.
+    """
+    entries, batch_idx, total_batches = payload
+
+    if prefix_messages is None:
+        prefix_messages = build_prompt_prefix(language_code, language_name)
+    messages = list(prefix_messages)
 
     # 실제 번역할 텍스트들을 JSON 배열로 구성
     texts_to_translate = [entry.id for entry in entries]
@@ -269,7 +512,10 @@ def translate_batch(payload, language_code, language_name):
                 "Did you forget to call configure_llm_caller() in main()?"
             )
 
-        translation_text = CALL_LLM_FN(messages)
+        call_fn = CALL_LLM_FN
+        if use_small_model and CALL_SMALL_LLM_FN is not None:
+            call_fn = CALL_SMALL_LLM_FN
+        translation_text = call_fn(messages, expected_items=len(entries))
 
         # JSON 파싱 시도
         try:
@@ -304,6 +550,10 @@ def translate_batch(payload, language_code, language_name):
                     actual=len(translations),
                 )
             )
+            if len(entries) > 1:
+                return retry_in_halves(
+                    payload, language_code, language_name,
+                    use_small_model, prefix_messages)
             print("Falling back: leaving msgstr empty for this batch.")
             results = []
             for entry in entries:
@@ -326,12 +576,144 @@ def translate_batch(payload, language_code, language_name):
                 error=e,
             )
         )
+        # JSON 파싱 실패는 batch가 작을수록 잘 성공하므로 나눠서 재시도
+        if isinstance(e, ValueError) and len(entries) > 1:
+            return retry_in_halves(
+                payload, language_code, language_name,
+                use_small_model, prefix_messages)
         results = []
         for entry in entries:
             results.append((entry.id, "", entry.locations))
         return results
 
 
+def retry_in_halves(payload, language_code, language_name,
+                    use_small_model, prefix_messages):
+    """
+    응답 파싱에 실패한 batch를 절반씩 나눠 다시 번역하는 함수.
+    Re-translates a failed batch as two smaller batches, so one bad
+    response no longer leaves the whole batch untranslated. Halving
+    stops at single entries, which fall back to an empty msgstr.
+
+    Returns:
+        list: [(msgid, translation, locations), ...] (원래 entry 순서 유지)
+    """
+    entries, batch_idx, total_batches = payload
+    print(
+        "Retrying batch [{idx}/{total}] as two batches of {a} and {b}.".format(
+            idx=batch_idx + 1,
+            total=total_batches,
+            a=len(entries) // 2,
+            b=len(entries) - len(entries) // 2,
+        )
+    )
+    mid = len(entries) // 2
+    results = []
+    for half in (entries[:mid], entries[mid:]):
+        results.extend(translate_batch(
+            (half, batch_idx, total_batches),
+            language_code,
+            language_name,
+            use_small_model=use_small_model,
+            prefix_messages=prefix_messages,
+        ))
+    return results
+
+
+def deduplicate_entries(entries):
+    """
+    같은 msgid를 가진 entry를 하나로 합쳐 LLM 호출을 한 번만 하도록 하는 함수.
+    Collapses entries sharing the same msgid (e.g. differing only in
+    msgctxt) so each msgid is sent to the LLM once.
+
+    Args:
+        entries (list): 번역 대상 entry 리스트
+
+    Returns:
+        list: msgid가 중복되지 않는 entry 리스트 (중복 entry의 locations는 병합됨)
+    """
+    unique = {}
+    for entry in entries:
+        first = unique.get(entry.id)
+        if first is None:
+            unique[entry.id] = entry
+        else:
+            first.locations.extend(
+                loc for loc in entry.locations if loc not in first.locations
+            )
+    return list(unique.values())
+
+
+def compile_glossary_terms(glossary):
+    """
+    glossary의 모든 용어를 하나의 alternation regex로 컴파일한다.
+    Compiles every glossary term into one case-insensitive-by-lowering
+    alternation (longest terms first), or returns None for an empty glossary.
+    """
+    terms = sorted({term.lower() for term in glossary if term},
+                   key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile("|".join(map(re.escape, terms)))
+
+
+def split_by_model(entries, glossary):
+    """
+    작은 모델로 번역해도 되는 짧은 entry와 나머지 entry를 나누는 함수.
+    Splits entries into (small, big): short msgids without glossary terms
+    go to the small model, everything else stays on the main model.
+
+    Args:
+        entries (list): 번역 대상 entry 리스트
+        glossary (dict): 영어 용어 -> 번역어
+
+    Returns:
+        tuple: (small_entries, big_entries)
+    """
+    # 용어마다 substring 검사를 반복하지 않도록 하나의 alternation regex로 묶음
+    term_re = compile_glossary_terms(glossary)
+    small_entries = []
+    big_entries = []
+    for entry in entries:
+        text = entry.id if isinstance(entry.id, str) else entry.id[0]
+        if (len(text) <= SMALL_MODEL_MAX_CHARS
+                and (term_re is None
+                     or term_re.search(text.lower()) is None)):
+            small_entries.append(entry)
+        else:
+            big_entries.append(entry)
+    return small_entries, big_entries
+
+
+def prune_glossary(glossary, term_re, entries, by_lower=None):
+    """
+    batch의 msgid에 실제로 등장하는 용어만 남긴 glossary를 반환하는 함수.
+    Returns the subset of the glossary whose terms occur in the batch.
+
+    Args:
+        glossary (dict): 영어 용어 -> 번역어
+        term_re (re.Pattern | None): compile_glossary_terms()의 결과
+        entries (list): batch에 포함된 entry 리스트
+        by_lower (dict | None): 소문자 용어 -> 원래 용어.
+            batch마다 다시 만들지 않도록 호출하는 쪽에서 한 번만 만들어 전달
+
+    Returns:
+        dict: batch에 등장하는 용어 -> 번역어
+    """
+    if term_re is None:
+        return {}
+    if by_lower is None:
+        by_lower = {term.lower(): term for term in glossary}
+    picked = {}
+    for entry in entries:
+        texts = [entry.id] if isinstance(entry.id, str) else entry.id
+        for text in texts:
+            for match in term_re.finditer(text.lower()):
+                term = by_lower[match.group(0)]
+                picked[term] = glossary[term]
+    return picked
+
+
 def create_batches(entries, batch_size):
     """
     Entry 리스트를 지정된 크기의 batch로 분할하는 함수.
@@ -354,7 +736,9 @@ def translate_pot_file(
         po_path,
         language_code,
         language_name,
-        batch_size=5):
+        batch_size=5,
+        glossary=None,
+        examples=None):
     """
     POT 파일을 읽어 batch 단위로 병렬 번역 후 PO 파일로 저장하는 함수.
     Reads a .pot file, translates entries in batches in parallel,
@@ -366,10 +750,19 @@ def translate_pot_file(
         language_code (str): 번역하는 언어 코드
         language_name (str): 번역하는 언어 이름
         batch_size (int): 한 번에 번역할 entry 개수 (기본값: 5)
+        glossary (dict | None): 이 언어의 용어집 (None이면 GLOSSARY)
+        examples (list | None): 이 언어의 few-shot 예시
+            (None이면 FEW_SHOT_EXAMPLES)
 
     Returns:
         None
     """
+    # 여러 언어를 동시에 번역할 수 있도록 언어별 데이터는 인자로 받음
+    if glossary is None:
+        glossary = GLOSSARY
+    if examples is None:
+        examples = FEW_SHOT_EXAMPLES
+
     with open(pot_path, "rb") as f:
         pot = pofile.read_po(f)
 
@@ -392,10 +785,49 @@ def translate_pot_file(
         start_idx = START_TRANSLATE if START_TRANSLATE is not None else 0
         end_idx = END_TRANSLATE if END_TRANSLATE is not None else len(entries_to_translate)
         entries_to_translate = entries_to_translate[start_idx:end_idx]
+    entries_to_translate = deduplicate_entries(entries_to_translate)
+    # 결과를 원래 POT 순서로 되돌릴 때 쓰는 msgid -> 위치
+    position = {entry.id: i for i, entry in enumerate(entries_to_translate)}
+
+    # 숫자/기호/URL 등은 LLM을 거치지 않고 msgid를 그대로 사용
+    passthrough_entries = []
+    llm_entries = []
+    for entry in entries_to_translate:
+        if is_passthrough(entry.id):
+            passthrough_entries.append(entry)
+        else:
+            llm_entries.append(entry)
+    # 캐시에 이미 번역이 있는 msgid는 LLM을 다시 호출하지 않음
+    cached_results = []
+    if TRANSLATION_CACHE is not None:
+        cache_namespace = translation_cache_namespace(
+            language_code, language_name, glossary, examples)
+        with CACHE_LOCK:
+            cached = load_cached_translations(
+                TRANSLATION_CACHE, cache_namespace, language_code,
+                [entry.id for entry in llm_entries])
+        cached_results = [
+            (entry.id, cached[entry.id], entry.locations)
+            for entry in llm_entries if entry.id in cached
+        ]
+        entries_to_translate = [
+            entry for entry in llm_entries if entry.id not in cached
+        ]
+    else:
+        entries_to_translate = llm_entries
     total_entries = len(entries_to_translate)
 
-    # entry를 batch로 분할
-    batches = create_batches(entries_to_translate, batch_size)
+    # entry를 batch로 분할 (작은 모델이 설정된 경우 짧은 entry는 따로 묶음)
+    if CALL_SMALL_LLM_FN is not None:
+        small_entries, big_entries = split_by_model(
+            entries_to_translate, glossary)
+        small_batches = create_batches(small_entries, batch_size)
+        batches = small_batches + create_batches(big_entries, batch_size)
+        use_small = [True] * len(small_batches)
+        use_small += [False] * (len(batches) - len(small_batches))
+    else:
+        batches = create_batches(entries_to_translate, batch_size)
+        use_small = [False] * len(batches)
     total_batches = len(batches)
 
     print(f"--- {os.path.basename(pot_path)}를 {language_code}로 번역 ---")
@@ -403,6 +835,13 @@ def translate_pot_file(
         f"총 {total_entries}개 entry를 {total_batches}개 batch로 나누어 번역합니다. "
         f"(Batch size: {batch_size}, Workers: {MAX_WORKERS})"
     )
+    if passthrough_entries:
+        print(
+            f"{len(passthrough_entries)}개 entry는 번역이 필요 없어 "
+            "msgid를 그대로 사용합니다."
+        )
+    if cached_results:
+        print(f"{len(cached_results)}개 entry는 번역 캐시를 사용합니다.")
 
     # (batch, 순서, 전체 batch 수)의 payload 만들기
     payloads = [
@@ -410,34 +849,92 @@ def translate_pot_file(
         for i, batch in enumerate(batches)
     ]
 
+    # system prompt / few-shot 메시지는 언어별로 한 번만 생성
+    # (glossary pruning 시에는 batch별 용어집을 붙인 prefix를 따로 만든다)
+    prefix_messages = build_prompt_prefix(
+        language_code, language_name,
+        glossary={} if PRUNE_GLOSSARY else glossary, examples=examples)
+    if PRUNE_GLOSSARY:
+        term_re = compile_glossary_terms(glossary)
+        by_lower = {term.lower(): term for term in glossary}
+        batch_prefixes = [
+            build_prompt_prefix(
+                language_code, language_name,
+                glossary=prune_glossary(glossary, term_re, batch, by_lower),
+                examples=examples)
+            for batch in batches
+        ]
+    else:
+        batch_prefixes = [prefix_messages] * total_batches
+    if WARM_UP_FN is not None and batches:
+        try:
+            WARM_UP_FN(prefix_messages)
+        except Exception as e:
+            print(f"Prompt warm-up failed, continuing without it: {e}")
+
     with concurrent.futures.ThreadPoolExecutor(
         max_workers=MAX_WORKERS
     ) as executor:
-        results = list(
-            tqdm(
-                executor.map(
-                    lambda payload: translate_batch(
-                        payload,
-                        language_code,
-                        language_name),
-                    payloads),
-                total=total_batches,
-                desc=f"Translating batches [{language_code}]",
-                unit="batch",
-            ))
-
-    for batch_result in results:
-        if batch_result:
-            for msgid, translation, locations in batch_result:
-                po.add(id=msgid, string=translation, locations=locations,
-                       user_comments=["Initial translation by AI."])
-
+        translate = functools.partial(
+            translate_batch,
+            language_code=language_code,
+            language_name=language_name,
+        )
+        futures = {
+            executor.submit(translate, payload,
+                            use_small_model=small, prefix_messages=prefix): i
+            for i, (payload, small, prefix) in enumerate(zip(
+                payloads, use_small, batch_prefixes))
+        }
+        # 끝난 순서대로 진행률을 갱신하고, 결과는 batch 순서 자리에 저장
+        results = [None] * total_batches
+        for future in tqdm(
+            concurrent.futures.as_completed(futures),
+            total=total_batches,
+            desc=f"Translating batches [{language_code}]",
+            unit="batch",
+        ):
+            batch_result = future.result()
+            results[futures[future]] = batch_result
+            # 중간에 중단되어도 끝난 batch는 다음 실행에서 재사용되도록 바로 저장
+            if TRANSLATION_CACHE is not None and batch_result:
+                with CACHE_LOCK:
+                    save_cached_translations(
+                        TRANSLATION_CACHE, cache_namespace, language_code,
+                        [(msgid, translation)
+                         for msgid, translation, _ in batch_result])
+
+    translated = [
+        item for batch_result in results if batch_result
+        for item in batch_result
+    ]
+    passthrough_ids = {entry.id for entry in passthrough_entries}
+    if CALL_SMALL_LLM_FN is not None or cached_results or passthrough_ids:
+        # 작은 모델 batch / 캐시 / passthrough 결과가 섞였으므로
+        # 원래 POT 순서로 되돌림
+        translated += cached_results
+        translated += [(entry.id, entry.id, entry.locations)
+                       for entry in passthrough_entries]
+        translated.sort(key=lambda item: position[item[0]])
+
+    for msgid, translation, locations in translated:
+        # passthrough entry는 AI 번역이 아니므로 주석을 달지 않음
+        comments = ([] if msgid in passthrough_ids
+                    else ["Initial translation by AI."])
+        po.add(id=msgid, string=translation, locations=locations,
+               user_comments=comments)
+
+    # 임시 파일에 먼저 쓰고 rename하여, 중단되더라도 반쯤 쓰인 PO가 남지 않게 함
+    tmp_path = po_path + ".tmp"
     try:
-        with open(po_path, "wb") as f:
+        with open(tmp_path, "wb") as f:
             pofile.write_po(f, po)
+        os.replace(tmp_path, po_path)
         print(f"{po_path}가 저장되었습니다.")
     except Exception as e:
         print(f"PO 파일 저장 실패: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 if __name__ == "__main__":
@@ -493,12 +990,26 @@ if __name__ == "__main__":
     llm_cfg = cfg.get("llm")
     MODEL_NAME = llm_cfg.get("model")
     LLM_MODE = llm_cfg.get("mode")
-    MAX_WORKERS = llm_cfg.get("workers")
-    configure_llm_caller(LLM_MODE, MODEL_NAME)
+    MAX_WORKERS = llm_cfg.get("workers") or 4
+    OLLAMA_TIMEOUT = llm_cfg.get("timeout")
+    OLLAMA_MAX_PREDICT = llm_cfg.get("num_predict") or OLLAMA_MAX_PREDICT
+    LANGUAGE_WORKERS = llm_cfg.get("language_workers") or 1
+    configure_llm_caller(
+        LLM_MODE,
+        MODEL_NAME,
+        num_thread=llm_cfg.get("num_thread"),
+        num_ctx=llm_cfg.get("num_ctx"),
+        requests_per_minute=llm_cfg.get("rpm"),
+        small_model_name=llm_cfg.get("small_model"),
+    )
     START_TRANSLATE = llm_cfg.get("start")
     end_val = llm_cfg.get("end")
     END_TRANSLATE = None if end_val == -1 else end_val
     BATCH_SIZE = llm_cfg.get("batch_size")
+    PRUNE_GLOSSARY = bool(llm_cfg.get("prune_glossary"))
+    if llm_cfg.get("cache"):
+        TRANSLATION_CACHE = open_translation_cache(
+            os.path.join(PO_DIR, ".translation_cache.db"))
 
     # -----------------------------
     # Glossary / Examples Config
@@ -543,16 +1054,14 @@ if __name__ == "__main__":
     base_name = os.path.basename(pot_file_path).replace(".pot", ".po")
 
     start = time.time()
-    # --- 언어 루프 ---
-    for lang_code in LANGUAGES_TO_TRANSLATE:
-        lang_start_time = time.time()
-        print(f"--- [{lang_code}] Language Translation Start ---")
 
+    # --- 언어별 준비: 용어집 / 예시 다운로드 ---
+    def prepare_language(lang_code):
         # 1. 언어 이름 찾기 (LANG_MAP 사용)
         language_name = LANG_MAP.get(lang_code, lang_code)
 
-        # 2. 전역 변수 GLOSSARY, FEW_SHOT_EXAMPLES 업데이트 (다운로드 포함)
-        GLOSSARY = load_glossary(
+        # 2. 언어별 GLOSSARY, FEW_SHOT_EXAMPLES 로드 (다운로드 포함)
+        glossary = load_glossary(
             lang_code,
             GLOSSARY_URL,
             GLOSSARY_PO_FILE,
@@ -560,7 +1069,7 @@ if __name__ == "__main__":
             GLOSSARY_DIR
         )
 
-        FEW_SHOT_EXAMPLES = load_fixed_examples(
+        examples = load_fixed_examples(
             lang_code,
             EXAMPLE_DIR,
             FIXED_EXAMPLE_JSON,
@@ -573,27 +1082,55 @@ if __name__ == "__main__":
         os.makedirs(model_lang_folder, exist_ok=True)
         po_file_path = os.path.join(model_lang_folder, base_name)
 
-        # 4. 번역 실행 (language_code, language_name, batch_size 전달)
+        return lang_code, language_name, glossary, examples, po_file_path
+
+    # 언어별 파일 다운로드는 네트워크 대기가 대부분이므로 동시에 진행
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(8, len(LANGUAGES_TO_TRANSLATE) or 1)
+    ) as executor:
+        language_jobs = list(
+            executor.map(prepare_language, LANGUAGES_TO_TRANSLATE))
+
+    def run_language(job):
+        lang_code, language_name, glossary, examples, po_file_path = job
+        lang_start_time = time.time()
+        print(f"--- [{lang_code}] Language Translation Start ---")
+
+        # 4. 번역 실행 (언어별 용어집 / 예시를 인자로 전달)
         translate_pot_file(
             pot_file_path,
             po_file_path,
             lang_code,
             language_name,
-            batch_size=BATCH_SIZE
+            batch_size=BATCH_SIZE,
+            glossary=glossary,
+            examples=examples,
         )
 
-        lang_end_time = time.time()
-        duration = round(lang_end_time - lang_start_time, 2)
+        duration = round(time.time() - lang_start_time, 2)
         print(f"---[{lang_code}] Language Translation End ({duration}s)---\n")
+        return duration
 
-        # 5. 로그 기록 (language 인자 추가)
-        save_experiment_log(
-            model_name=MODEL_NAME,
-            pot_file=pot_file_path,
-            po_file=po_file_path,
-            duration_sec=duration,
-            language=lang_code
-        )
+    # --- 언어 루프: language_workers개 언어를 동시에 번역 ---
+    # 언어마다 workers개의 batch를 보내므로 동시 요청 수는 두 값의 곱
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=LANGUAGE_WORKERS
+    ) as executor:
+        futures = {
+            executor.submit(run_language, job): job for job in language_jobs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            lang_code, _, _, _, po_file_path = futures[future]
+            duration = future.result()
+
+            # 5. 로그 기록 (language 인자 추가)
+            save_experiment_log(
+                model_name=MODEL_NAME,
+                pot_file=pot_file_path,
+                po_file=po_file_path,
+                duration_sec=duration,
+                language=lang_code
+            )
     end = time.time()
     duration = round(end - start, 2)
     print(f"Total translation time: {duration}s")
\ No newline at end of file
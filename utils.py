@@ -3,10 +3,73 @@ import json
 import subprocess
 from datetime import datetime
 import argparse
+import functools
+import itertools
 import requests
-from babel.messages import pofile
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import sqlite3
+from babel.messages.pofile import unescape
 import csv
 
+# 지원 언어 코드 -> 프롬프트에 쓰는 언어 이름
+LANG_MAP = {
+    "vi_VN": "Vietnamese (Vietnam)",
+    "ur": "Urdu",
+    "tr_TR": "Turkish (Turkey)",
+    "Th": "Thai",
+    "te_IN": "Telugu (India)",
+    "ta": "Tamil",
+    "es_MX": "Spanish (Mexico)",
+    "es": "Spanish",
+    "sl_SI": "Slovenian (Slovenia)",
+    "sr": "Serbian",
+    "ru": "Russian",
+    "Ro": "Romanian",
+    "pa_IN": "Punjabi (India)",
+    "pt_BR": "Portuguese (Brazil)",
+    "pt": "Portuguese",
+    "pl_PL": "Polish (Poland)",
+    "fa": "Persian",
+    "ne": "Nepali",
+    "mr": "Marathi",
+    "mni": "Manipuri",
+    "mai": "Maithili",
+    "lo": "Lao",
+    "ko_KR": "Korean (South Korea)",
+    "kok": "Konkani",
+    "ks": "Kashmiri",
+    "kn": "Kannada",
+    "ja": "Japanese",
+    "it": "Italian",
+    "id": "Indonesian",
+    "hu": "Hungarian",
+    "hi": "Hindi",
+    "he": "Hebrew",
+    "gu": "Gujarati",
+    "el": "Greek",
+    "de": "German",
+    "ka_GE": "Georgian (Georgia)",
+    "fr": "French",
+    "fi_FI": "Finnish (Finland)",
+    "fil": "Filipino",
+    "eo": "Esperanto",
+    "en_US": "English (United States)",
+    "en_GB": "English (United Kingdom)",
+    "en_AU": "English (Australia)",
+    "nl_NL": "Dutch (Netherlands)",
+    "cs": "Czech",
+    "zh_TW": "Chinese (Taiwan)",
+    "zh_CN": "Chinese (China)",
+    "ca": "Catalan",
+    "bg_BG": "Bulgarian (Bulgaria)",
+    "brx": "Bodo",
+    "bn_IN": "Bengali (India)",
+    "as": "Assamese",
+    "ar": "Arabic",
+    "sq": "Albanian",
+}
+
 
 def parse_args():
     """
@@ -104,6 +167,52 @@ def parse_args():
     return parser.parse_args()
 
 
+@functools.lru_cache(maxsize=None)
+def get_http_session():
+    """
+    다운로드에 공유하는 requests.Session (keep-alive + 재시도).
+    Reuses one connection per host across the glossary / example / POT
+    downloads and retries transient failures with backoff.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    session.mount("http://", HTTPAdapter(max_retries=retry))
+    return session
+
+
+def download_file(url, path, timeout=30, chunk_size=1 << 16):
+    """
+    URL의 내용을 chunk 단위로 스트리밍하여 파일로 저장한다.
+    Streams a download to disk chunk by chunk instead of holding the whole
+    body in memory.
+
+    Args:
+        url (str): 다운로드 URL
+        path (str): 저장할 파일 경로
+        timeout (int): 요청 타임아웃(초)
+        chunk_size (int): 한 번에 쓰는 바이트 수
+
+    Raises:
+        requests.exceptions.RequestException: 다운로드 실패 시
+    """
+    # 중간에 실패해도 잘린 파일이 남아 다음 실행에서 재사용되지 않도록
+    # 임시 파일에 받은 뒤 rename
+    tmp_path = path + ".part"
+    try:
+        with get_http_session().get(
+                url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 def init_environment(
     pot_dir,
     po_dir,
@@ -139,10 +248,7 @@ def init_environment(
     if not os.path.exists(pot_file_path):
         print(f"Downloading pot file from {pot_url}...")
         try:
-            response = requests.get(pot_url, timeout=30)
-            response.raise_for_status()
-            with open(pot_file_path, "wb") as f:
-                f.write(response.content)
+            download_file(pot_url, pot_file_path)
             print(f"Successfully downloaded and saved to {pot_file_path}")
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"Error downloading POT file: {e}")
@@ -152,6 +258,48 @@ def init_environment(
     return pot_file_path
 
 
+def iter_po_pairs(path):
+    """
+    PO 파일에서 (msgid, msgstr) 쌍만 순서대로 읽어온다. Catalog는 만들지 않는다.
+    Streams the translated singular entries of a PO file line by line.
+    Header, obsolete (#~), plural and untranslated entries are skipped.
+
+    Args:
+        path (str): PO 파일 경로
+
+    Yields:
+        tuple: (msgid, msgstr)
+    """
+    msgid = msgstr = current = None
+    plural = False
+    with open(path, "r", encoding="utf-8") as f:
+        # 마지막 entry도 끝나도록 빈 줄을 하나 덧붙여 순회
+        for line in itertools.chain(f, [""]):
+            if line.startswith('"'):
+                if current is not None:
+                    current.append(unescape(line.strip()))
+                continue
+            if line.startswith('msgstr "'):
+                msgstr = [unescape(line[7:].strip())]
+                current = msgstr
+                continue
+            if line.startswith(("msgid_plural", "msgstr[")):
+                plural = True
+                current = None
+                continue
+            # 그 밖의 줄(빈 줄, 주석, msgctxt, 다음 msgid)은 entry의 끝
+            if msgid is not None and msgstr is not None and not plural:
+                mid = "".join(msgid)
+                mstr = "".join(msgstr)
+                if mid and mstr:
+                    yield mid, mstr
+            msgid = msgstr = current = None
+            plural = False
+            if line.startswith('msgid "'):
+                msgid = [unescape(line[6:].strip())]
+                current = msgid
+
+
 def load_glossary(lang, url_template, glossary_file, json_file, glossary_dir):
     """
     특정 언어의 glossary.po 파일을 다운로드/로드하고 JSON 백업을 생성/로드한다.
@@ -185,16 +333,20 @@ def load_glossary(lang, url_template, glossary_file, json_file, glossary_dir):
     if not os.path.exists(glossary_po_path):
         print(f"Downloading glossary for [{lang}] from {glossary_url}...")
         try:
-            response = requests.get(glossary_url, timeout=30)
-            response.raise_for_status()
-            with open(glossary_po_path, "wb") as f:
-                f.write(response.content)
+            download_file(glossary_url, glossary_po_path)
             print(f"Successfully downloaded and saved to {glossary_po_path}\n")
         except requests.exceptions.RequestException as e:
             print(f"Warning: Could not download glossary for [{lang}]: {e}\n")
             return G
 
-    if os.path.exists(glossary_json_path):
+    # JSON 캐시는 glossary.po보다 최신일 때만 사용 (po가 갱신되면 다시 생성)
+    json_is_fresh = os.path.exists(glossary_json_path) and (
+        not os.path.exists(glossary_po_path)
+        or os.path.getmtime(glossary_json_path)
+        >= os.path.getmtime(glossary_po_path)
+    )
+
+    if json_is_fresh:
         print(f"Loading cached glossary for [{lang}]...")
         try:
             with open(glossary_json_path, "r", encoding="utf-8") as f:
@@ -207,16 +359,14 @@ def load_glossary(lang, url_template, glossary_file, json_file, glossary_dir):
         if os.path.exists(glossary_po_path):
             print(f"Building glossary for [{lang}]...")
             try:
-                with open(glossary_po_path, "rb") as f:
-                    glossary_po = pofile.read_po(f)
                 G = {
-                    entry.id.strip().lower(): entry.string.strip()
-                    for entry in glossary_po
-                    if entry.id and entry.string
+                    msgid.strip().lower(): msgstr.strip()
+                    for msgid, msgstr in iter_po_pairs(glossary_po_path)
                 }
                 print(f"Glossary for [{lang}] loaded with {len(G)} terms.\n")
                 with open(glossary_json_path, "w", encoding="utf-8") as f:
-                    json.dump(G, f, ensure_ascii=False, indent=2)
+                    # 캐시 용도이므로 들여쓰기 없이 저장해 쓰기/읽기 크기를 줄임
+                    json.dump(G, f, ensure_ascii=False, separators=(",", ":"))
                 print(f"Backup JSON written to {glossary_json_path}\n")
             except Exception as e:
                 print(f"Error reading Glossary PO file for [{lang}]: {e}\n")
@@ -224,7 +374,8 @@ def load_glossary(lang, url_template, glossary_file, json_file, glossary_dir):
     return G
 
 
-def load_examples(lang, url_template, example_file, example_dir):
+def load_examples(lang, url_template, example_file, example_dir,
+                  limit=None):
     """
     특정 언어의 번역 예시 .po 파일을 다운로드/로드하여 리스트로 반환한다.
     Loads/downloads a language-specific example .po file
@@ -235,6 +386,7 @@ def load_examples(lang, url_template, example_file, example_dir):
         url_template (str): 다운로드 URL 템플릿
         example_file (str): example .po 파일명
         example_dir (str): 예시 파일 최상위 디렉터리
+        limit (int | None): 앞에서부터 이 개수만 읽음 (None이면 전체)
 
     Returns:
         list: (msgid, msgstr) 튜플의 리스트
@@ -254,10 +406,7 @@ def load_examples(lang, url_template, example_file, example_dir):
     if not os.path.exists(example_path):
         print(f"Downloading examples for [{lang}] from {example_url}...")
         try:
-            response = requests.get(example_url, timeout=30)
-            response.raise_for_status()
-            with open(example_path, "wb") as f:
-                f.write(response.content)
+            download_file(example_url, example_path)
             print(f"Successfully downloaded and saved to {example_path}\n")
         except requests.exceptions.RequestException as e:
             print(f"Warning: Could not download examples for [{lang}]: {e}\n")
@@ -269,12 +418,9 @@ def load_examples(lang, url_template, example_file, example_dir):
             f"{os.path.basename(example_path)} for [{lang}]..."
         )
         try:
-            with open(example_path, "rb") as f:
-                example_po = pofile.read_po(f)
-
-            for entry in example_po:
-                if entry.id and entry.string:
-                    examples.append((entry.id, entry.string))
+            # 필요한 개수만큼만 읽고 파일의 나머지는 파싱하지 않음
+            examples = list(
+                itertools.islice(iter_po_pairs(example_path), limit))
             print(f"Loaded {len(examples)} examples for [{lang}].\n")
         except Exception as e:
             print(
@@ -327,7 +473,7 @@ def load_fixed_examples(
 
     try:
         all_examples_from_po = load_examples(
-            lang_code, example_url, example_file, example_dir
+            lang_code, example_url, example_file, example_dir, limit=2
         )
 
         if not all_examples_from_po:
@@ -345,6 +491,105 @@ def load_fixed_examples(
         return []
 
 
+def open_translation_cache(db_path):
+    """
+    모델/언어/msgid별 번역 결과를 저장하는 sqlite 캐시를 연다.
+    Opens (and creates if needed) the sqlite translation cache.
+
+    Args:
+        db_path (str): 캐시 DB 파일 경로
+
+    Returns:
+        sqlite3.Connection: 캐시 DB 연결
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    # 여러 언어를 thread로 동시에 번역할 때도 같은 연결을 쓸 수 있게 함
+    # (접근은 호출하는 쪽에서 lock으로 직렬화)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # WAL: 읽기와 쓰기가 서로 막지 않고, commit마다 전체 fsync를 하지 않음
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS translations ("
+        "model TEXT NOT NULL, "
+        "lang TEXT NOT NULL, "
+        "msgid TEXT NOT NULL, "
+        "msgstr TEXT NOT NULL, "
+        "PRIMARY KEY (model, lang, msgid))"
+    )
+    return conn
+
+
+def _cache_key(msgid):
+    # 복수형 msgid는 tuple이므로 JSON 문자열로 바꿔 저장
+    if isinstance(msgid, str):
+        return msgid
+    return json.dumps(list(msgid), ensure_ascii=False)
+
+
+def load_cached_translations(conn, model_name, lang, msgids):
+    """
+    캐시에 저장된 번역을 msgid -> msgstr 딕셔너리로 반환한다.
+    Returns cached translations for the given msgids.
+
+    Args:
+        conn (sqlite3.Connection): open_translation_cache()의 결과
+        model_name (str): 사용한 LLM 모델 이름 (prompt fingerprint 포함 가능)
+        lang (str): 번역 언어 코드
+        msgids (list): 조회할 msgid 리스트
+
+    Returns:
+        dict: 캐시에 있는 msgid -> msgstr
+    """
+    cached = {}
+    for msgid in msgids:
+        row = conn.execute(
+            "SELECT msgstr FROM translations "
+            "WHERE model = ? AND lang = ? AND msgid = ?",
+            (model_name, lang, _cache_key(msgid)),
+        ).fetchone()
+        if row is not None:
+            cached[msgid] = row[0]
+    return cached
+
+
+def save_cached_translations(conn, model_name, lang, translations):
+    """
+    번역이 채워진 (msgid, msgstr) 쌍을 캐시에 한 번의 트랜잭션으로 저장한다.
+    Stores non-empty translations in the cache in one transaction.
+
+    Args:
+        conn (sqlite3.Connection): open_translation_cache()의 결과
+        model_name (str): 사용한 LLM 모델 이름
+        lang (str): 번역 언어 코드
+        translations (list): [(msgid, msgstr), ...]
+    """
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+            [
+                (model_name, lang, _cache_key(msgid), msgstr)
+                for msgid, msgstr in translations if msgstr
+            ],
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_git_info():
+    """
+    현재 저장소의 (commit, branch)를 반환한다. 실패하면 (None, None).
+    Runs a single `git rev-parse` per process; the checkout does not
+    change while translating, so every log entry reuses the result.
+    """
+    try:
+        commit, branch = subprocess.check_output(
+            ["git", "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
+            stderr=subprocess.DEVNULL
+        ).decode("utf-8").split()
+    except Exception:
+        return None, None
+    return commit, branch
+
+
 def save_experiment_log(
     model_name: str,
     pot_file: str,
@@ -372,20 +617,7 @@ def save_experiment_log(
     """
 
     # Git 정보 수집
-    try:
-        git_commit = subprocess.check_output(
-            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
-        ).decode("utf-8").strip()
-    except Exception:
-        git_commit = None
-
-    try:
-        git_branch = subprocess.check_output(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            stderr=subprocess.DEVNULL
-        ).decode("utf-8").strip()
-    except Exception:
-        git_branch = None
+    git_commit, git_branch = get_git_info()
 
     # 결과 entry 구성
     result_entry = {
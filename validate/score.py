@@ -6,6 +6,7 @@ Compare two PO files semantically using SimCSE.
 - Save JSON report
 - Update ONLY the LAST row of experiments.csv with summary metrics
 - (Optional) Auto-select latest .po via --b-latest-in [--b-pattern]
+- (Optional) Cache embeddings per (model, text) in sqlite via --cache
 
 Usage examples:
   python score.py --a base.po --b new.po --out result.json
@@ -16,16 +17,17 @@ from __future__ import annotations
 from datetime import datetime
 import argparse
 import csv
+import hashlib
 import io
 import json
-import re
+import sqlite3
 import statistics
 import sys
 from pathlib import Path
 
 import polib
 import torch
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 from babel.messages.pofile import read_po as babel_read_po
 
 
@@ -36,7 +38,8 @@ def normalize_text(s: str, do_norm: bool = False, do_lower: bool = False) -> str
     if s is None:
         s = ""
     if do_norm:
-        s = re.sub(r"\s+", " ", s.strip())
+        # split() collapses the same (Unicode) whitespace as \s+, in C
+        s = " ".join(s.split())
     if do_lower:
         s = s.lower()
     return s
@@ -106,9 +109,47 @@ def load_po_entries(path: Path, only_translated=False, skip_fuzzy=False,
         return m
 
 
-def batched(iterable, n: int):
-    for i in range(0, len(iterable), n):
-        yield iterable[i:i + n]
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def open_embedding_cache(path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the sqlite embedding cache."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embeddings ("
+        "model TEXT NOT NULL, "
+        "hash TEXT NOT NULL, "
+        "vec BLOB NOT NULL, "
+        "PRIMARY KEY (model, hash))"
+    )
+    return conn
+
+
+def load_cached_embeddings(conn, model: str, hashes) -> dict[str, bytes]:
+    """Return {hash: float32 bytes} for the hashes already in the cache."""
+    found = {}
+    hashes = list(hashes)
+    # Stay below SQLite's default limit of 999 bound variables
+    for i in range(0, len(hashes), 500):
+        chunk = hashes[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT hash, vec FROM embeddings WHERE model = ? "
+            f"AND hash IN ({marks})", [model, *chunk])
+        found.update(rows)
+    return found
+
+
+def save_cached_embeddings(conn, model: str, items) -> None:
+    """Store (hash, float32 bytes) pairs in one transaction."""
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, hash, vec) "
+            "VALUES (?, ?, ?)",
+            [(model, h, v) for h, v in items])
 
 
 def find_latest_po(directory: Path, pattern: str | None = None) -> Path:
@@ -142,12 +183,27 @@ def main():
     ap.add_argument("--out", required=True, help="Path (ignored name; JSON saved under validate/json/<po>_timestamp.json)")
     ap.add_argument("--model", default="princeton-nlp/sup-simcse-roberta-base")
     ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--half", action=argparse.BooleanOptionalAction,
+                    default=None,
+                    help="Run the encoder in FP16 (default: on for CUDA)")
+    ap.add_argument("--backend", choices=["torch", "onnx", "openvino"],
+                    default="torch",
+                    help="Encoder runtime; onnx/openvino export the model on "
+                         "first use (needs sentence-transformers>=3.2 and "
+                         "optimum)")
     ap.add_argument("--threshold", type=float, default=0.80)
     ap.add_argument("--only-translated", action="store_true")
     ap.add_argument("--skip-fuzzy", action="store_true")
     ap.add_argument("--normalize-text", action="store_true")
     ap.add_argument("--lowercase", action="store_true")
     ap.add_argument("--topk", type=int, default=20)
+    ap.add_argument("--cache", action="store_true",
+                    help="Reuse embeddings from earlier runs (see "
+                         "--cache-path)")
+    ap.add_argument("--cache-path",
+                    default=str(Path(__file__).resolve().parent
+                                / ".embedding_cache.db"),
+                    help="sqlite file caching embeddings per (model, text)")
     ap.add_argument("--experiments_csv",
                     default=str(Path(__file__).resolve().parent.parent / "experiments.csv"))
     args = ap.parse_args()
@@ -175,7 +231,9 @@ def main():
     B = load_po_entries(pb, args.only_translated, args.skip_fuzzy,
                         args.normalize_text, args.lowercase)
 
-    common_keys = sorted(set(A.keys()) & set(B.keys()))
+    # Keep A's file order; the scores are order-independent, so there is
+    # no need to build two key sets and sort their intersection.
+    common_keys = [k for k in A if k in B]
     if not common_keys:
         print("[WARN] No overlapping msgid keys.", file=sys.stderr)
 
@@ -183,20 +241,77 @@ def main():
 
     # --- Model
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = SentenceTransformer(args.model, device=device)
+    if args.backend == "torch":
+        model = SentenceTransformer(args.model, device=device)
+    else:
+        model = SentenceTransformer(args.model, device=device,
+                                    backend=args.backend)
+    # FP16 uses tensor cores on GPU; the embeddings are still normalized,
+    # so the cosine scores change only slightly. --no-half keeps FP32.
+    use_half = args.half if args.half is not None else device == "cuda"
+    use_half = use_half and args.backend == "torch"
+    if use_half:
+        model.half()
 
     sims: list[float] = []
 
     def encode_texts(texts):
-        return model.encode(texts, convert_to_tensor=True, normalize_embeddings=True)
-
-    for batch in batched(pairs, args.batch_size):
-        a_texts = [p[1] for p in batch]
-        b_texts = [p[2] for p in batch]
-        emb_a = encode_texts(a_texts)
-        emb_b = encode_texts(b_texts)
-        cos = util.cos_sim(emb_a, emb_b).diag().tolist()
-        sims.extend(cos)
+        # Score in FP32 even for an FP16 model, so cached and freshly
+        # encoded embeddings give exactly the same similarities.
+        return model.encode(texts, batch_size=args.batch_size,
+                            convert_to_tensor=True, normalize_embeddings=True,
+                            show_progress_bar=False).float()
+
+    def encode_cached(texts):
+        # Embeddings depend only on (model, text), so re-runs on the same
+        # PO pair (e.g. with another --threshold) only encode new texts.
+        # FP16 and FP32 models give different vectors, so the precision
+        # is part of the key; rows are stored as the FP32 encode() output.
+        precision = "fp16" if use_half else "fp32"
+        key = f"{args.model}|{args.backend}|{precision}"
+        hashes = [text_hash(t) for t in texts]
+        conn = open_embedding_cache(Path(args.cache_path))
+        try:
+            found = load_cached_embeddings(conn, key, hashes)
+            miss = [i for i, h in enumerate(hashes) if h not in found]
+            if miss:
+                new = encode_texts([texts[i] for i in miss])
+                new = new.cpu().numpy()
+                items = [(hashes[i], row.tobytes())
+                         for i, row in zip(miss, new)]
+                save_cached_embeddings(conn, key, items)
+                found.update(items)
+        finally:
+            conn.close()
+        print(f"[cache] {len(texts) - len(miss)}/{len(texts)} embeddings "
+              f"reused from {args.cache_path}")
+        buf = bytearray(b"".join(found[h] for h in hashes))
+        emb = torch.frombuffer(buf, dtype=torch.float32)
+        return emb.view(len(texts), -1).to(device)
+
+    if pairs:
+        # PO files repeat short strings (and A often equals B), so map
+        # every distinct text to one row and encode each of them once.
+        index: dict[str, int] = {}
+        for _, a_text, b_text in pairs:
+            index.setdefault(a_text, len(index))
+            index.setdefault(b_text, len(index))
+        # Encode them in a single call: encode() sorts its input by length,
+        # so every mini-batch pads only to texts of a similar length
+        # instead of the longest one in an arbitrary slice.
+        texts = list(index)
+        with torch.inference_mode():
+            if args.cache:
+                emb = encode_cached(texts)
+            else:
+                emb = encode_texts(texts)
+            idx_a = torch.tensor([index[p[1]] for p in pairs],
+                                 device=emb.device)
+            idx_b = torch.tensor([index[p[2]] for p in pairs],
+                                 device=emb.device)
+            # Embeddings are L2-normalized, so the cosine of each (a, b)
+            # pair is their dot product; no need for the BxB cos_sim matrix.
+            sims = (emb[idx_a] * emb[idx_b]).sum(dim=1).cpu().tolist()
 
     # --- Stats
     if sims:
@@ -220,6 +335,8 @@ def main():
             "file_b": str(pb),
             "model": args.model,
             "device": device,
+            "backend": args.backend,
+            "half": use_half,
             "threshold": args.threshold,
             "only_translated": args.only_translated,
             "skip_fuzzy": args.skip_fuzzy,